@@ -1,153 +1,448 @@
+import errno
+import fnmatch
 import logging
 import os
+import random
+import re
 import shutil
 import subprocess
 import argparse
+import tempfile
+import threading
 import time
 import getpass
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 import stat
 
-# Setup Logging
+try:
+    import pathspec  # Optional: gives real .gitignore (gitwildmatch) semantics
+except ImportError:
+    pathspec = None
+
+# Setup Logging. WARNING by default keeps the logger off the hot path;
+# --verbose in main raises it to INFO.
 logger = logging.getLogger('DeploymentLogger')
-logger.setLevel(logging.INFO)
+logger.setLevel(logging.WARNING)
 handler = logging.FileHandler('deployment.log')
 formatter = logging.Formatter('%(asctime)s:%(levelname)s:%(message)s')
 handler.setFormatter(formatter)
 logger.addHandler(handler)
 
+@dataclass(frozen=True)
+class DeployPaths:
+    """All filesystem locations for one deployment, computed once from the
+    repository URL and the two base directories and shared by every step."""
+    repo_name: str
+    base_destination: str
+    base_backup: str
+    destination: str
+    backup: str
+    staging: str
+    old: str
+
+    @classmethod
+    def from_base_paths(cls, git_url, base_destination_path, backup_base_path):
+        repo_name = os.path.basename(git_url).replace('.git', '')
+        destination = os.path.join(base_destination_path, repo_name)
+        return cls(
+            repo_name=repo_name,
+            base_destination=base_destination_path,
+            base_backup=backup_base_path,
+            destination=destination,
+            backup=os.path.join(backup_base_path, repo_name),
+            staging=f"{destination}.new",
+            old=f"{destination}.old",
+        )
+
+@lru_cache(maxsize=1)
 def verify_git_installation():
-    """Check if Git is installed."""
+    """Check if Git is installed. Success is memoized, so repeated deploys
+    in the same process don't re-exec "git --version" every time; a raise
+    is not cached and the check runs again on the next call."""
     logger.info("Starting verify_git_installation function.")
     try:
-        subprocess.check_output(["git", "--version"])
+        subprocess.run(["git", "--version"], capture_output=True, text=True, check=True)
         logger.info("Git is installed.")
     except subprocess.CalledProcessError as e:
         logger.error("Git is not installed. Please install Git to proceed.")
         raise EnvironmentError("Git is not installed. Please install Git to proceed.") from e
 
-def retry_operation(operation, max_retries=3, delay=5):
-    """Retries a file operation in case of failure."""
+def retry_operation(operation, max_retries=3, delay=5, max_delay=60):
+    """Retries a file operation in case of failure, sleeping a random
+    interval that grows exponentially with each attempt. The full jitter
+    decorrelates retries across concurrent deploys hitting the same flaky
+    filesystem or git host, avoiding synchronized retry storms."""
     logger.info("Starting retry_operation function.")
     for attempt in range(max_retries):
         try:
             operation()
             return True
         except Exception as e:
-            logger.error(f"Operation failed: {e}. Retrying {attempt + 1}/{max_retries}...")
-            time.sleep(delay)
+            logger.error("Operation failed: %s. Retrying %d/%d...", e, attempt + 1, max_retries)
+            time.sleep(random.uniform(0, min(max_delay, delay * (2 ** attempt))))
     return False
 
 def read_gitignore(path):
     """Reads the .gitignore file and returns a list of patterns to ignore."""
     logger.info("Starting read_gitignore function.")
     gitignore_path = Path(path) / ".gitignore"
-    if gitignore_path.exists():
-        with open(gitignore_path, "r") as file:
-            return [line.strip() for line in file if line.strip() and not line.startswith("#")]
-    return []
+    try:
+        # One read syscall for the whole file; splitlines is C-implemented,
+        # so no per-line trip through the text decoder.
+        data = gitignore_path.read_bytes()
+    except OSError:
+        return []
+    lines = (line.strip() for line in data.splitlines())
+    return [line.decode() for line in lines if line and not line.startswith(b"#")]
+
+def _compile_ignore(patterns):
+    """Compiles ignore patterns into a copytree-style ignore callable.
+    With pathspec installed the patterns get real .gitignore semantics
+    (**, negations, directory-only suffixes); otherwise the fnmatch
+    translations are compiled once here instead of being recompiled by
+    shutil.ignore_patterns for every directory visited."""
+    always_ignored = {'.git', '.gitignore'}
+    if pathspec is not None:
+        spec = pathspec.PathSpec.from_lines('gitwildmatch', patterns)
+        def ignore(root, names):
+            return always_ignored.union(
+                name for name in names if spec.match_file(os.path.join(root, name)))
+        return ignore
+    regexes = [re.compile(fnmatch.translate(pattern)) for pattern in patterns]
+    def ignore(root, names):
+        return always_ignored.union(
+            name for name in names if any(regex.match(name) for regex in regexes))
+    return ignore
+
+# Native bulk-copy tool detected once at import time; None means neither
+# rsync nor robocopy is on PATH and we fall back to the Python copier.
+_COPY_TOOL = shutil.which("rsync") or shutil.which("robocopy")
 
-def backup_artifacts(destination_path, backup_repo_path, ignore_patterns):
+def _fast_copytree(src, dst, ignore_globs=()):
+    """Copies a directory tree, delegating the bulk copy to rsync (POSIX) or
+    robocopy (Windows) when available. These tools batch metadata syscalls and
+    use in-kernel copies, avoiding the per-file Python overhead entirely.
+    Falls back to _parallel_copytree when neither tool exists."""
+    logger.info("Starting _fast_copytree function.")
+    excludes = ['.git', '.gitignore'] + list(ignore_globs)
+    if _COPY_TOOL and os.path.basename(_COPY_TOOL).startswith("rsync"):
+        command = [_COPY_TOOL, "-a", "--delete"]
+        command += [f"--exclude={pattern}" for pattern in excludes]
+        command += [os.path.join(src, ""), os.path.join(dst, "")]
+        subprocess.run(command, check=True)
+    elif _COPY_TOOL:  # robocopy
+        command = [_COPY_TOOL, src, dst, "/MIR", "/NFL", "/NDL", "/NJH", "/NJS",
+                   "/XD", ".git", "/XF", ".gitignore"] + list(ignore_globs)
+        result = subprocess.run(command)
+        if result.returncode > 7:  # Robocopy codes <= 7 indicate success
+            raise subprocess.CalledProcessError(result.returncode, command)
+    else:
+        _parallel_copytree(src, dst, ignore=_compile_ignore(list(ignore_globs)))
+
+def _fast_copy(src, dst):
+    """Copies a single file with os.copy_file_range where the platform has
+    it: the bytes move entirely in the kernel (and become a reflink on CoW
+    filesystems like Btrfs/XFS) without crossing into Python. Falls back to
+    a large-buffer copyfileobj loop elsewhere."""
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            size = os.fstat(fsrc.fileno()).st_size
+            copied = 0
+            while copied < size:
+                step = os.copy_file_range(fsrc.fileno(), fdst.fileno(), size - copied)
+                if step == 0:
+                    break
+                copied += step
+        except (AttributeError, OSError):
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+            shutil.copyfileobj(fsrc, fdst, 1 << 20)
+    shutil.copystat(src, dst)
+
+def _link_or_copy(src, dst):
+    """Hardlinks src to dst, falling back to a real copy when the two paths
+    live on different filesystems. A hardlink is a pure metadata operation,
+    so cloning a tree this way moves no data bytes at all."""
+    try:
+        os.link(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        _fast_copy(src, dst)
+
+def _parallel_copytree(src, dst, ignore=None, workers=None, copy_function=_fast_copy):
+    """Copies a directory tree like shutil.copytree, but fans the per-file
+    copies out over a thread pool. File copies release the GIL in the
+    underlying read/write syscalls, so this scales near-linearly on trees
+    with many small files."""
+    logger.info("Starting _parallel_copytree function.")
+    if workers is None:
+        workers = min(32, (os.cpu_count() or 1) * 4)
+    copy_jobs = []
+    for root, dirs, files in os.walk(src, followlinks=False):
+        if ignore is not None:
+            ignored = ignore(root, dirs + files)
+            dirs[:] = [d for d in dirs if d not in ignored]
+            files = [f for f in files if f not in ignored]
+        dst_root = os.path.join(dst, os.path.relpath(root, src))
+        os.makedirs(dst_root, exist_ok=True)
+        for name in files:
+            copy_jobs.append((os.path.join(root, name), os.path.join(dst_root, name)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(copy_function, s, d) for s, d in copy_jobs]
+        for future in as_completed(futures):
+            future.result()  # Propagate the first copy error, if any
+
+def backup_artifacts(paths, ignore_patterns):
     """Backs up the deployment artifacts according to .gitignore patterns."""
     logger.info("Starting backup_artifacts function.")
     def operation():
-        if os.path.exists(backup_repo_path):
-            shutil.rmtree(backup_repo_path)  # Remove the existing backup directory
-        shutil.copytree(destination_path, backup_repo_path, ignore=shutil.ignore_patterns('.git', '.gitignore', *ignore_patterns))
-        logger.info(f"Backup created at: {backup_repo_path}")
-        return backup_repo_path
+        if os.path.exists(paths.backup):
+            _fast_rmtree(paths.backup)  # Remove the existing backup directory
+        # Hardlink the snapshot rather than copying it: the backup is
+        # read-only until rollback, and deploy_repo removes the live tree
+        # before writing new content, so the linked files are never mutated.
+        _parallel_copytree(paths.destination, paths.backup,
+                           ignore=_compile_ignore(ignore_patterns),
+                           copy_function=_link_or_copy)
+        logger.info("Backup created at: %s", paths.backup)
+        return paths.backup
 
     if retry_operation(operation):
-        return backup_repo_path
+        return paths.backup
     else:
         logger.error("Error creating backup after multiple attempts.")
         return None
 
-def restore_backup(backup_repo_path, destination_path):
+def restore_backup(paths):
     """Restores the backup in case of deployment failure."""
     logger.info("Starting restore_backup function.")
     def operation():
-        if os.path.exists(destination_path):
-            shutil.rmtree(destination_path)
-        shutil.copytree(backup_repo_path, destination_path, ignore=shutil.ignore_patterns('.git', '.gitignore'), dirs_exist_ok=True)
-        logger.info(f"Backup restored from {backup_repo_path} to {destination_path}")
-        print(f"Backup restored from {backup_repo_path} to {destination_path}")
+        if os.path.exists(paths.destination):
+            _fast_rmtree(paths.destination)
+        _fast_copytree(paths.backup, paths.destination)
+        logger.info("Backup restored from %s to %s", paths.backup, paths.destination)
+        print(f"Backup restored from {paths.backup} to {paths.destination}")
 
     if not retry_operation(operation):
         logger.error("Error restoring backup after multiple attempts.")
         print("Error restoring backup after multiple attempts.")
 
+@contextmanager
+def _git_askpass_env(github_token):
+    """Supplies the token to git through a throwaway GIT_ASKPASS helper
+    instead of splicing it into the URL. This keeps the token out of argv
+    (visible in ps) and subprocess error output, and because every git call
+    now sees the same URL, git's connection reuse cache stays effective."""
+    suffix = ".bat" if os.name == "nt" else ".sh"
+    fd, askpass_path = tempfile.mkstemp(suffix=suffix)
+    try:
+        script = (f"@echo {github_token}\r\n" if os.name == "nt"
+                  else f"#!/bin/sh\necho '{github_token}'\n")
+        os.write(fd, script.encode())
+        os.close(fd)
+        os.chmod(askpass_path, stat.S_IRWXU)
+        yield {**os.environ, "GIT_ASKPASS": askpass_path, "GIT_TERMINAL_PROMPT": "0"}
+    finally:
+        os.unlink(askpass_path)
+
+# branch_exists answers cached for a short TTL, keyed on (url, branch) —
+# deliberately not on the token — so deploys seconds apart skip the network
+# round-trip. --no-cache in main disables it.
+_BRANCH_CACHE = {}
+_BRANCH_CACHE_TTL = 60  # seconds
+_BRANCH_CACHE_ENABLED = True
+
+# Hex strings from a short SHA (7) up to SHA-256 length (64).
+_SHA_RE = re.compile(r"[0-9a-f]{7,64}")
+
 def branch_exists(git_url, branch, github_token):
     """Checks if the specified branch exists in the remote repository."""
     logger.info("Starting branch_exists function.")
-    auth_git_url = git_url.replace("https://", f"https://{github_token}@")
-    try:
-        output = subprocess.check_output(["git", "ls-remote", "--heads", auth_git_url, branch])
-        return bool(output)
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Error checking branch existence: {e}")
-        return False
+    if _SHA_RE.fullmatch(branch):
+        # A raw commit SHA is not a branch and can't be confirmed cheaply
+        # by ls-remote; accept it here and let checkout validate it.
+        return True
+    cache_key = (git_url, branch)
+    if _BRANCH_CACHE_ENABLED:
+        hit = _BRANCH_CACHE.get(cache_key)
+        if hit is not None and hit[1] > time.monotonic():
+            return hit[0]
+    # Protocol v2 sends the ref prefix to the server, which then advertises
+    # only the matching ref instead of every ref in the repository; with
+    # --exit-code the return code directly encodes existence.
+    command = ["git", "-c", "protocol.version=2", "ls-remote", "--exit-code",
+               "--heads", "--refs", git_url, f"refs/heads/{branch}"]
+    with _git_askpass_env(github_token) as env:
+        result = subprocess.run(command, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.PIPE, env=env)
+    if result.returncode in (0, 2):  # ls-remote --exit-code: 2 means no matching refs
+        exists = result.returncode == 0
+        _BRANCH_CACHE[cache_key] = (exists, time.monotonic() + _BRANCH_CACHE_TTL)
+        return exists
+    logger.error("Error checking branch existence: %s", result.stderr.decode(errors='replace').strip())
+    return False
 
 def get_current_branch(destination_path):
     """Returns the current branch name of the repository at the given destination path."""
     logger.info("Starting get_current_branch function.")
+    # .git/HEAD is a tiny "ref: refs/heads/<name>" file; reading it directly
+    # avoids a fork/exec of git and any change to the process working directory.
     try:
-        os.chdir(destination_path)  # Change to the destination directory
-        branch_name = subprocess.check_output(["git", "rev-parse", "--abbrev-ref", "HEAD"]).decode('utf-8').strip()
-        return branch_name
+        head = (Path(destination_path) / ".git" / "HEAD").read_text().strip()
+        if head.startswith("ref: "):
+            return head.split("refs/heads/", 1)[-1]
+        return head  # Detached HEAD: the file holds the raw commit SHA
+    except OSError:
+        pass  # .git may be a worktree pointer file; ask git itself below
+    try:
+        command = ["git", "-C", destination_path, "rev-parse", "--abbrev-ref", "HEAD"]
+        return subprocess.check_output(command).decode('utf-8').strip()
     except subprocess.CalledProcessError as e:
-        logger.error(f"Error retrieving the current branch name: {e}")
+        logger.error("Error retrieving the current branch name: %s", e)
         return None
     except Exception as e:
-        logger.error(f"Unexpected error occurred while retrieving the current branch name: {e}")
+        logger.error("Unexpected error occurred while retrieving the current branch name: %s", e)
         return None
 
+def _on_rm_error(func, path, exc_info):
+    """rmtree error handler: makes the offending path writable and retries.
+    Keeps the chmod cost proportional to the paths that actually fail
+    instead of pre-chmodding the whole tree."""
+    os.chmod(path, stat.S_IRWXU)
+    func(path)
+
+# Native deletion tool, detected once at import time like _COPY_TOOL.
+# Windows stays on the pure-Python path.
+_RM_TOOL = shutil.which("rm") if os.name != "nt" else None
+
+def _fast_rmtree(path):
+    """Removes a directory tree, shelling out to rm -rf where available.
+    rm runs its getdents/unlinkat loop in C with no Python frames per
+    entry, which is several times faster on trees with tens of thousands
+    of files. Falls back to shutil.rmtree with the chmod-and-retry
+    handler when rm is missing or fails."""
+    if _RM_TOOL:
+        result = subprocess.run([_RM_TOOL, "-rf", "--", path], stderr=subprocess.DEVNULL)
+        if result.returncode == 0:
+            return
+    shutil.rmtree(path, onerror=_on_rm_error)
+
+def _make_writable_fwalk(git_path, pool_threshold=512):
+    """Makes every entry under git_path writable. The work list is gathered
+    with os.fwalk (one scandir per directory, no re-stat per entry); small
+    trees are chmodded serially, while trees past pool_threshold fan the
+    chmods out over a thread pool — os.chmod releases the GIL, so the
+    syscalls overlap. A fresh .git has thousands of entries under objects/,
+    which is where the pool pays off."""
+    paths = []
+    for root, dirs, files, rootfd in os.fwalk(git_path):
+        paths.extend(os.path.join(root, name) for name in dirs + files)
+    if len(paths) <= pool_threshold:
+        for path in paths:
+            os.chmod(path, stat.S_IRWXU)
+        return
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(lambda path: os.chmod(path, stat.S_IRWXU), paths, chunksize=128))
+
 def make_git_writable_and_remove(git_path):
-    """Changes the permissions of the .git directory to writable and removes it."""
+    """Removes the .git directory, making read-only entries writable on demand."""
     logger.info("Starting make_git_writable_and_remove function.")
-    for root, dirs, files in os.walk(git_path):
-        for dir in dirs:
-            os.chmod(os.path.join(root, dir), stat.S_IRWXU | stat.S_IRWXG | stat.S_IRWXO)
-        for file in files:
-            os.chmod(os.path.join(root, file), stat.S_IRWXU | stat.S_IRWXG | stat.S_IRWXO)
-    shutil.rmtree(git_path)
-
-def clone_repo(git_url, temp_clone_path, branch, github_token):
-    """Clones the given GitHub repository into a temporary location."""
+    try:
+        _fast_rmtree(git_path)
+    except OSError:
+        # A read-only parent directory can defeat the per-path handler;
+        # make the whole tree writable in one fd-based pass and retry.
+        _make_writable_fwalk(git_path)
+        shutil.rmtree(git_path)
+
+def clone_repo(git_url, clone_path, branch, github_token):
+    """Clones the given GitHub repository into the given location."""
     logger.info("Starting clone_repo function.")
-    auth_git_url = git_url.replace("https://", f"https://{github_token}@")
-    if branch_exists(git_url, branch, github_token):
-        if not os.path.exists(temp_clone_path):
-            os.makedirs(temp_clone_path)
-        command = ["git", "clone", "-b", branch, "--single-branch", auth_git_url, temp_clone_path]
-        try:
-            subprocess.run(command, check=True)
-            logger.info(f"Repository cloned successfully into {temp_clone_path} on branch '{branch}'.")
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Error cloning repository: subprocess error occurred - {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error occurred while cloning repository: {e}")
-            raise
+    if not os.path.exists(clone_path):
+        os.makedirs(clone_path)
+    # The clone performs its own ref lookup, so a separate ls-remote
+    # pre-check would only add a second network round-trip; a missing
+    # branch is detected from the clone's own error output instead.
+    pinned_commit = _SHA_RE.fullmatch(branch) is not None
+    if pinned_commit:
+        # git clone -b rejects raw SHAs, and --depth 1 would exclude older
+        # commits, so fetch the default branch history (blobs still lazy)
+        # and detach onto the pinned commit afterwards.
+        command = ["git", "clone", "--no-tags", "--filter=blob:none",
+                   git_url, clone_path]
     else:
-        logger.error(f"Error: The branch '{branch}' does not exist in the remote repository.")
-        raise ValueError(f"The branch '{branch}' does not exist in the remote repository.")
+        command = ["git", "clone", "--depth", "1", "--no-tags", "--filter=blob:none",
+                   "-b", branch, "--single-branch", git_url, clone_path]
+    try:
+        with _git_askpass_env(github_token) as env:
+            subprocess.run(command, check=True, capture_output=True, text=True, env=env)
+            if pinned_commit:
+                subprocess.run(["git", "-C", clone_path, "checkout", "--detach", branch],
+                               check=True, capture_output=True, text=True, env=env)
+        logger.info("Repository cloned successfully into %s on branch '%s'.", clone_path, branch)
+    except subprocess.CalledProcessError as e:
+        if re.search(r"Remote branch .* not found|did not match any", e.stderr or ""):
+            logger.error("Error: The branch or commit '%s' does not exist in the remote repository.", branch)
+            raise ValueError(f"The branch or commit '{branch}' does not exist in the remote repository.") from e
+        logger.error("Error cloning repository: subprocess error occurred - %s", e)
+        raise
+    except Exception as e:
+        logger.error("Unexpected error occurred while cloning repository: %s", e)
+        raise
 
-def deploy_repo(git_url, base_destination_path, branch, github_token, backup_base_path):
+def _stage_and_swap(git_url, branch, github_token, paths):
+    """Builds the new deployment next to the live one and swaps it in with
+    renames. rename is an O(1) same-filesystem inode operation, so the
+    window during which readers see no deployment shrinks from the length
+    of a full tree delete-and-clone to microseconds, and a failed clone
+    never touches the live tree at all."""
+    logger.info("Starting _stage_and_swap function.")
+    if os.path.exists(paths.staging):
+        _fast_rmtree(paths.staging)
+    try:
+        # Build and validate the new tree entirely in the staging directory
+        clone_repo(git_url, paths.staging, branch, github_token)
+        make_git_writable_and_remove(os.path.join(paths.staging, '.git'))
+        gitignore_file = os.path.join(paths.staging, '.gitignore')
+        if os.path.exists(gitignore_file):
+            os.remove(gitignore_file)
+    except Exception:
+        if os.path.exists(paths.staging):
+            _fast_rmtree(paths.staging)
+        raise
+    had_previous = os.path.exists(paths.destination)
+    if had_previous:
+        if os.path.exists(paths.old):
+            _fast_rmtree(paths.old)  # Leftover from an interrupted deploy
+        os.rename(paths.destination, paths.old)
+    try:
+        os.rename(paths.staging, paths.destination)
+    except OSError:
+        if had_previous:
+            os.rename(paths.old, paths.destination)  # Put the live tree back
+        raise
+    if had_previous:
+        # Deleting the replaced tree is off the critical path; the next
+        # deploy clears any remnant if this thread doesn't finish in time.
+        threading.Thread(target=_fast_rmtree, args=(paths.old,), daemon=True).start()
+
+def deploy_repo(git_url, branch, github_token, paths):
     logger.info("Starting deploy_repo function.")
     verify_git_installation()
 
-    repo_name = os.path.basename(git_url).replace('.git', '')
-    destination_path = os.path.join(base_destination_path, repo_name)
-    backup_repo_path = os.path.join(backup_base_path, repo_name)
-    temp_clone_path = os.path.join(base_destination_path, f"{repo_name}_temp")
-    
-    if not os.path.isdir(base_destination_path):
+    destination_path = paths.destination
+    if not os.path.isdir(paths.base_destination):
         logger.error("The base destination path is not a valid directory.")
         print("The base destination path is not a valid directory.")
         return
 
-    if not os.path.isdir(backup_base_path):
+    if not os.path.isdir(paths.base_backup):
         logger.error("The base backup path is not a valid directory.")
         print("The base backup path is not a valid directory.")
         return
@@ -157,28 +452,15 @@ def deploy_repo(git_url, base_destination_path, branch, github_token, backup_bas
 
     if os.path.exists(destination_path):
         # Backup current deployment before making any changes
-        backup_repo_path = backup_artifacts(destination_path, backup_repo_path, ignore_patterns)
+        backup_repo_path = backup_artifacts(paths, ignore_patterns)
         if backup_repo_path:
             try:
-                # Clean the destination path
-                if not retry_operation(lambda: shutil.rmtree(destination_path)):
-                    logger.error("Failed to clean the destination path after multiple attempts. Deployment aborted.")
-                    print("Failed to clean the destination path. Deployment aborted.")
-                    return
-
-                os.makedirs(destination_path)
-                # Clone the repository to a temporary location
-                clone_repo(git_url, temp_clone_path, branch, github_token)
-                # Make .git directory writable and remove it in the temporary location
-                make_git_writable_and_remove(os.path.join(temp_clone_path, '.git'))
-                # Copy the contents from the temporary location to the destination path, excluding .git and .gitignore
-                shutil.copytree(temp_clone_path, destination_path, ignore=shutil.ignore_patterns('.git', '.gitignore'), dirs_exist_ok=True)
-                # Remove the temporary clone path
-                shutil.rmtree(temp_clone_path)
-                logger.info(f"Deployment updated successfully for repository {git_url} on branch {branch}. Backup created at {backup_repo_path}.")
+                # Build the new tree in staging and atomically swap it in
+                _stage_and_swap(git_url, branch, github_token, paths)
+                logger.info("Deployment updated successfully for repository %s on branch %s. Backup created at %s.", git_url, branch, backup_repo_path)
                 print(f"Deployment updated successfully for repository {git_url} on branch {branch}. Backup created at {backup_repo_path}.")
             except Exception as e:
-                logger.error(f"Deployment failed: {e}. Initiating rollback.")
+                logger.error("Deployment failed: %s. Initiating rollback.", e)
                 print("Deployment failed. Initiating rollback.")
                 rollback_needed = True
         else:
@@ -187,51 +469,50 @@ def deploy_repo(git_url, base_destination_path, branch, github_token, backup_bas
             return
     else:
         try:
-            os.makedirs(destination_path)
-            # Clone the repository to a temporary location
-            clone_repo(git_url, temp_clone_path, branch, github_token)
-            # Make .git directory writable and remove it in the temporary location
-            make_git_writable_and_remove(os.path.join(temp_clone_path, '.git'))
-            # Copy the contents from the temporary location to the destination path, excluding .git and .gitignore
-            shutil.copytree(temp_clone_path, destination_path, ignore=shutil.ignore_patterns('.git', '.gitignore'), dirs_exist_ok=True)
-            # Remove the temporary clone path
-            shutil.rmtree(temp_clone_path)
-            logger.info(f"Repository {git_url} cloned successfully into {destination_path} on branch '{branch}'.")
+            # Build the new tree in staging and atomically move it into place
+            _stage_and_swap(git_url, branch, github_token, paths)
+            logger.info("Repository %s cloned successfully into %s on branch '%s'.", git_url, destination_path, branch)
             print(f"Repository {git_url} cloned successfully into {destination_path} on branch '{branch}'")
         except Exception as e:
-            logger.error(f"Deployment failed: {e}")
+            logger.error("Deployment failed: %s", e)
             print("Deployment failed.")
             rollback_needed = True
 
-    if rollback_needed and os.path.exists(backup_repo_path):
-        restore_backup(backup_repo_path, destination_path)
+    if rollback_needed and os.path.exists(paths.backup):
+        restore_backup(paths)
         print("Rollback completed. Backup reinstated.")
         logger.info("Rollback completed. Backup reinstated.")
 
 def main():
+    global _BRANCH_CACHE_ENABLED
     logger.info("Starting main function.")
     parser = argparse.ArgumentParser(description="Deploy a GitHub repository.")
     parser.add_argument("--rollback", action="store_true", help="Perform rollback using the backup.")
+    parser.add_argument("--verbose", action="store_true", help="Log informational messages, not just warnings and errors.")
+    parser.add_argument("--no-cache", action="store_true", help="Always ask the remote about branch existence instead of using cached answers.")
     args = parser.parse_args()
 
+    if args.verbose:
+        logger.setLevel(logging.INFO)
+    if args.no_cache:
+        _BRANCH_CACHE_ENABLED = False
+
     git_url = input("Enter the GitHub repository URL: ").strip()
     base_destination_path = input("Enter the base destination path for the repository: ").strip()
-    branch = input("Enter the branch name to deploy (default is 'master'): ").strip() or "master"
+    branch = input("Enter the branch name or commit SHA to deploy (default is 'master'): ").strip() or "master"
     github_token = getpass.getpass("Enter your GitHub Personal Access Token: ").strip()
     backup_base_path = input("Enter the base path for the backup: ").strip()
 
-    repo_name = os.path.basename(git_url).replace('.git', '')
-    backup_repo_path = os.path.join(backup_base_path, repo_name)
-    destination_path = os.path.join(base_destination_path, repo_name)
+    paths = DeployPaths.from_base_paths(git_url, base_destination_path, backup_base_path)
 
     if args.rollback:
-        if os.path.exists(backup_repo_path):
-            restore_backup(backup_repo_path, destination_path)
+        if os.path.exists(paths.backup):
+            restore_backup(paths)
         else:
             print("Backup path does not exist. Rollback failed.")
             logger.error("Backup path does not exist. Rollback failed.")
     else:
-        deploy_repo(git_url, base_destination_path, branch, github_token, backup_base_path)
+        deploy_repo(git_url, branch, github_token, paths)
 
 if __name__ == "__main__":
     main()